@@ -0,0 +1,50 @@
+import asyncio
+import re
+
+from adk.api import agents
+
+from .crm_tools import discard_customer_profile, prefetch_customer_profile
+from .parallel_tools import tool_executor
+
+_CUSTOMER_NAME_RE = re.compile(r"[Cc]ustomer\s+([A-Z]\w*)")
+
+async def run_agent_scenario(agent: agents.Agent, prompt: str, scenario_title: str) -> tuple:
+    """Helper function to run a single agent scenario and time it."""
+    loop = asyncio.get_running_loop()
+
+    start_time = loop.time()
+    # Most prompts name a customer whose profile the agent looks up first, so
+    # start that lookup now and let it overlap with the agent's first turn.
+    match = _CUSTOMER_NAME_RE.search(prompt)
+    speculative = prefetch_customer_profile(match.group(1), tool_executor) if match else None
+    try:
+        # Scenarios draft emails, create cases and send notifications, so they
+        # always run the agent instead of replaying a cached response.
+        response = await asyncio.to_thread(agent.run, prompt)
+    finally:
+        if speculative is not None:
+            discard_customer_profile(match.group(1), speculative)
+    end_time = loop.time()
+
+    return scenario_title, prompt, end_time - start_time, response
+
+
+def print_scenario_result(scenario_title: str, prompt: str, elapsed: float, response):
+    """Helper function to print the outcome of a single agent scenario."""
+    print("=" * 60)
+    print(f"🎬 SCENARIO: {scenario_title}")
+    print(f"👤 TAM PROMPT: \"{prompt}\"")
+    print("-" * 60)
+
+    print("\n" + "-" * 20 + " AGENT FINAL SUMMARY " + "-" * 20)
+    print(response)
+    print(f"\n✅ SCENARIO COMPLETE (Execution time: {elapsed:.2f} seconds)")
+    print("=" * 60 + "\n\n")
+
+
+async def run_all_scenarios(agent: agents.Agent, scenarios) -> list:
+    """Runs every scenario concurrently; each one is independent and I/O bound."""
+    return await asyncio.gather(*[
+        run_agent_scenario(agent, scenario["prompt"], scenario["title"])
+        for scenario in scenarios
+    ])
@@ -4,26 +4,41 @@
 # Date: September 8, 2025
 
 import os
-import json
+import asyncio
+import calendar
+import functools
+import hashlib
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+import orjson
+from cachetools import TTLCache
+
+if TYPE_CHECKING:
+    # Annotation only; to_arrow() imports pyarrow on first use, keeping it off the cold start
+    import pyarrow as pa
+
 # Google Cloud imports
 import functions_framework
+from flask import Response, stream_with_context
 from google.cloud import bigquery
 from google.cloud import monitoring_v3
 from google.cloud import billing_v1
 from google.cloud import securitycenter
 from google.cloud import recommender_v1
-from google.cloud.support_v2 import CaseServiceClient
+from google.cloud.support_v2 import Case, CaseServiceClient
 from google.api_core.client_options import ClientOptions
 from google.oauth2 import service_account
 from vertexai import generative_models
+from vertexai.preview import caching
 from vertexai.preview import rag
-from vertexai.preview.generative_models import Tool, FunctionDeclaration, Schema, Type
+from vertexai.preview.generative_models import Content, GenerativeModel, Part, Tool, FunctionDeclaration, Schema, Type
 import vertexai
 
 # Configure logging
@@ -84,6 +99,7 @@ class Config:
     BIGQUERY_DATASET = 'tam_agent_analytics'
     VERTEX_AI_MODEL = 'gemini-1.5-pro'
     RAG_CORPUS_NAME = 'tam-knowledge-base'
+    RAG_CORPUS = f"projects/{PROJECT_ID}/locations/{REGION}/ragCorpora/{RAG_CORPUS_NAME}"
     
     # Service Account paths
     SA_FUNCTIONS = 'sa-tam-agent-functions'
@@ -95,6 +111,110 @@ class Config:
     # BigQuery Tables
     TABLE_COST_USAGE = f"{PROJECT_ID}.{BIGQUERY_DATASET}.project_cost_and_usage_daily"
     TABLE_SUPPORT_HISTORY = f"{PROJECT_ID}.{BIGQUERY_DATASET}.support_case_history"
+    TABLE_PROJECT_COST_DAILY = f"{PROJECT_ID}.{BIGQUERY_DATASET}.project_cost_daily"
+    
+    # Query result cache
+    QUERY_CACHE_SIZE = 1024
+    QUERY_CACHE_TTL_SECONDS = 600
+    
+    # Vertex AI context cache. Off by default: the current preamble is far below
+    # the minimum cacheable size and the model name has no version suffix, so
+    # only enable it once both are in place.
+    CONTEXT_CACHE_ENABLED = os.environ.get('CONTEXT_CACHE_ENABLED', '').lower() == 'true'
+    CONTEXT_CACHE_TTL = timedelta(hours=1)
+    CONTEXT_CACHE_REFRESH_MARGIN = timedelta(minutes=5)
+    
+    # HTTP response caching (Cache-Control header values). Responses are keyed by
+    # the JSON request body, which shared caches ignore, so they stay private.
+    CACHE_CONTROL_PLATFORM_HEALTH = "private, max-age=300"
+    CACHE_CONTROL_SUPPORT_CASES = "private, max-age=30"
+    CACHE_CONTROL_QBR = "private, max-age=3600"
+    
+    # Agent tool calling
+    MAX_TOOL_TURNS = 5
+    MAX_CONCURRENT_TOOL_CALLS = 5
+
+# ==========================================
+# Shared API Clients
+# ==========================================
+# Clients are created once per process so warm instances reuse their
+# gRPC channels and credentials instead of rebuilding them per request.
+
+@functools.lru_cache(maxsize=1)
+def _query_client() -> monitoring_v3.QueryServiceClient:
+    return monitoring_v3.QueryServiceClient()
+
+@functools.lru_cache(maxsize=1)
+def _billing_client() -> billing_v1.CloudBillingClient:
+    return billing_v1.CloudBillingClient()
+
+@functools.lru_cache(maxsize=1)
+def _scc_client() -> securitycenter.SecurityCenterClient:
+    return securitycenter.SecurityCenterClient()
+
+@functools.lru_cache(maxsize=1)
+def _recommender_client() -> recommender_v1.RecommenderClient:
+    return recommender_v1.RecommenderClient()
+
+@functools.lru_cache(maxsize=1)
+def _bq_client() -> bigquery.Client:
+    return bigquery.Client()
+
+@functools.lru_cache(maxsize=1)
+def _support_client() -> CaseServiceClient:
+    client_options = ClientOptions(api_endpoint=Config.SUPPORT_API_ENDPOINT)
+    return CaseServiceClient(client_options=client_options)
+
+# ==========================================
+# BigQuery Query Result Cache
+# ==========================================
+
+_query_cache = TTLCache(maxsize=Config.QUERY_CACHE_SIZE, ttl=Config.QUERY_CACHE_TTL_SECONDS)
+_query_cache_lock = threading.Lock()
+
+def _cached_query(bq_client: bigquery.Client, query: str,
+                  query_parameters: List[bigquery.ScalarQueryParameter]) -> "pa.Table":
+    """Run a parameterized query, reusing results seen within the cache TTL"""
+    
+    key = (query, frozenset((p.name, p.type_, p.value) for p in query_parameters))
+    with _query_cache_lock:
+        if key in _query_cache:
+            return _query_cache[key]
+    
+    job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
+    # Large results stream as Arrow record batches over the BigQuery Storage
+    # Read API; small ones that fit in the first page stay on the REST path.
+    table = bq_client.query(query, job_config=job_config).to_arrow(create_bqstorage_client=True)
+    
+    with _query_cache_lock:
+        _query_cache[key] = table
+    return table
+
+# ==========================================
+# Response Helpers
+# ==========================================
+
+def _json_response(payload: Any, status: int = 200, request=None,
+                   cache_control: Optional[str] = None, vary: Optional[str] = None) -> tuple:
+    """Build a Cloud Function JSON response from a dataclass or dict"""
+    # orjson serializes dataclasses natively, without an asdict() deep copy
+    body = orjson.dumps(payload)
+    headers = {"Content-Type": "application/json"}
+    
+    if cache_control is not None:
+        headers["Cache-Control"] = cache_control
+    if vary is not None:
+        headers["Vary"] = vary
+    
+    # Only GET/HEAD responses are cacheable, and a matching If-None-Match on
+    # any other method must be answered with 412 rather than 304.
+    if cache_control is not None and request is not None and request.method in ("GET", "HEAD"):
+        etag = hashlib.sha256(body).hexdigest()
+        headers["ETag"] = f'"{etag}"'
+        if etag in request.if_none_match:
+            return b"", 304, headers
+    
+    return body, status, headers
 
 # ==========================================
 # Cloud Function: Platform Health Check
@@ -109,54 +229,60 @@ def get_platform_health(request):
     try:
         request_json = request.get_json(silent=True)
         if not request_json or 'project_id' not in request_json:
-            return json.dumps({"error": "Missing 'project_id' in request"}), 400
+            return _json_response({"error": "Missing 'project_id' in request"}, 400)
         
         project_id = request_json['project_id']
         time_period_days = request_json.get('time_period_days', 7)
         
         # Initialize health checker
         health_checker = PlatformHealthChecker(project_id)
-        health_summary = health_checker.check_health(time_period_days)
+        health_summary = asyncio.run(health_checker.check_health(time_period_days))
         
         response = PlatformHealthResponse(
             project_id=project_id,
             health_summary=health_summary
         )
         
-        return json.dumps(asdict(response)), 200
+        return _json_response(response, request=request,
+                              cache_control=Config.CACHE_CONTROL_PLATFORM_HEALTH)
         
     except Exception as e:
         logger.error(f"Error in get_platform_health: {str(e)}")
-        return json.dumps({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 class PlatformHealthChecker:
     """Handles platform health check logic"""
     
     def __init__(self, project_id: str):
         self.project_id = project_id
-        self.monitoring_client = monitoring_v3.MetricServiceClient()
-        self.billing_client = billing_v1.CloudBillingClient()
-        self.scc_client = securitycenter.SecurityCenterClient()
-        self.recommender_client = recommender_v1.RecommenderClient()
-        self.bq_client = bigquery.Client()
+        self.query_client = _query_client()
+        self.billing_client = _billing_client()
+        self.scc_client = _scc_client()
+        self.recommender_client = _recommender_client()
+        self.bq_client = _bq_client()
     
-    def check_health(self, time_period_days: int) -> HealthSummary:
+    async def check_health(self, time_period_days: int) -> HealthSummary:
         """Comprehensive health check across multiple dimensions"""
         
-        end_time = datetime.now()
+        # Snap the window to the hour so repeated requests within the same
+        # hour produce identical query parameters and can be served from cache.
+        end_time = datetime.now().replace(minute=0, second=0, microsecond=0)
         start_time = end_time - timedelta(days=time_period_days)
-        
-        # Check performance metrics
-        performance_status = self._check_performance_metrics(start_time, end_time)
-        
-        # Check cost trends
-        cost_trend = self._analyze_cost_trend(start_time, end_time)
-        
-        # Check security findings
-        critical_findings = self._check_security_findings(start_time)
-        
-        # Get optimization recommendations
-        recommendations = self._get_recommendations()
+        since_iso = start_time.isoformat(timespec='seconds') + 'Z'
+        
+        # The four checks hit independent APIs, so run them concurrently.
+        # Each check already falls back to a neutral value on failure.
+        (
+            performance_status,
+            cost_trend,
+            critical_findings,
+            recommendations,
+        ) = await asyncio.gather(
+            asyncio.to_thread(self._check_performance_metrics, start_time, end_time),
+            asyncio.to_thread(self._analyze_cost_trend, start_time, end_time),
+            asyncio.to_thread(self._check_security_findings, since_iso),
+            asyncio.to_thread(self._get_recommendations),
+        )
         
         return HealthSummary(
             performance_status=performance_status.value,
@@ -169,35 +295,34 @@ class PlatformHealthChecker:
         """Check CPU, memory, and latency metrics"""
         
         project_name = f"projects/{self.project_id}"
-        interval = monitoring_v3.TimeInterval(
-            {
-                "end_time": {"seconds": int(end_time.timestamp())},
-                "start_time": {"seconds": int(start_time.timestamp())},
-            }
-        )
         
-        # Query CPU utilization
-        cpu_query = monitoring_v3.ListTimeSeriesRequest(
-            name=project_name,
-            filter='metric.type="compute.googleapis.com/instance/cpu/utilization"',
-            interval=interval,
-            view=monitoring_v3.ListTimeSeriesRequest.TimeSeriesView.FULL,
-        )
+        # Count high-CPU points (80% threshold) across all instances inside
+        # Monitoring, so only one aggregated series comes back.
+        cpu_query = f"""
+        fetch gce_instance
+        | metric 'compute.googleapis.com/instance/cpu/utilization'
+        | filter val() > 0.8
+        | group_by [], [high_cpu_points: count(val())]
+        | every 1m
+        | within d'{start_time:%Y/%m/%d %H:%M}', d'{end_time:%Y/%m/%d %H:%M}'
+        """
         
         try:
-            cpu_results = self.monitoring_client.list_time_series(request=cpu_query)
+            cpu_results = self.query_client.query_time_series(
+                request={"name": project_name, "query": cpu_query}
+            )
             
             # Analyze results
-            high_cpu_count = 0
-            for ts in cpu_results:
-                for point in ts.points:
-                    if point.value.double_value > 0.8:  # 80% threshold
-                        high_cpu_count += 1
+            high_cpu_count = sum(
+                point.values[0].int64_value
+                for ts in cpu_results
+                for point in ts.point_data
+            )
             
-            if high_cpu_count > 10:
-                return HealthStatus.WARNING
-            elif high_cpu_count > 20:
+            if high_cpu_count > 20:
                 return HealthStatus.CRITICAL
+            elif high_cpu_count > 10:
+                return HealthStatus.WARNING
             else:
                 return HealthStatus.OK
                 
@@ -210,30 +335,29 @@ class PlatformHealthChecker:
         
         query = f"""
         SELECT 
-            SUM(cost) as total_cost,
+            SUM(total_cost) as total_cost,
             DATE(usage_date) as date
-        FROM `{Config.TABLE_COST_USAGE}`
+        FROM `{Config.TABLE_PROJECT_COST_DAILY}`
         WHERE project_id = @project_id
             AND usage_date BETWEEN @start_date AND @end_date
         GROUP BY date
         ORDER BY date
         """
         
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("project_id", "STRING", self.project_id),
-                bigquery.ScalarQueryParameter("start_date", "DATE", start_time.date()),
-                bigquery.ScalarQueryParameter("end_date", "DATE", end_time.date()),
-            ]
-        )
+        query_parameters = [
+            bigquery.ScalarQueryParameter("project_id", "STRING", self.project_id),
+            bigquery.ScalarQueryParameter("start_date", "DATE", start_time.date()),
+            bigquery.ScalarQueryParameter("end_date", "DATE", end_time.date()),
+        ]
         
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            results = list(query_job.result())
+            results = _cached_query(self.bq_client, query, query_parameters)
+            
+            daily_costs = results.column("total_cost").to_pylist()
             
-            if len(results) >= 2:
-                first_cost = results[0].total_cost
-                last_cost = results[-1].total_cost
+            if len(daily_costs) >= 2:
+                first_cost = daily_costs[0]
+                last_cost = daily_costs[-1]
                 trend_percent = ((last_cost - first_cost) / first_cost) * 100
                 return round(trend_percent, 2)
             return 0.0
@@ -242,24 +366,31 @@ class PlatformHealthChecker:
             logger.warning(f"Could not analyze cost trend: {e}")
             return 0.0
     
-    def _check_security_findings(self, since: datetime) -> int:
+    def _check_security_findings(self, since_iso: str) -> int:
         """Count new critical security findings"""
         
         parent = f"organizations/{self._get_org_id()}/sources/-"
         
+        # state="ACTIVE" skips inactive findings. event_time moves forward when
+        # a finding is re-detected, so long-lived findings seen in the window count.
         filter_str = (
             f'severity="CRITICAL" AND '
-            f'event_time > "{since.isoformat()}Z"'
+            f'state="ACTIVE" AND '
+            f'event_time > "{since_iso}"'
         )
         
         try:
-            findings = self.scc_client.list_findings(
+            # Let SCC count the matches server-side instead of paging
+            # through every finding just to count it.
+            groups = self.scc_client.group_findings(
                 request={
                     "parent": parent,
-                    "filter": filter_str
+                    "filter": filter_str,
+                    "group_by": "severity",
+                    "page_size": 1000,
                 }
             )
-            return sum(1 for _ in findings)
+            return sum(group.count for group in groups)
             
         except Exception as e:
             logger.warning(f"Could not fetch security findings: {e}")
@@ -298,62 +429,76 @@ def get_support_cases(request):
     try:
         request_json = request.get_json(silent=True)
         if not request_json or 'customer_account_id' not in request_json:
-            return json.dumps({"error": "Missing 'customer_account_id'"}), 400
+            return _json_response({"error": "Missing 'customer_account_id'"}, 400)
         
         customer_id = request_json['customer_account_id']
         
         # Initialize support case manager
         case_manager = SupportCaseManager()
-        response = case_manager.get_open_cases(customer_id)
+        response = asyncio.run(case_manager.get_open_cases(customer_id))
         
-        return json.dumps(asdict(response)), 200
+        return _json_response(response, request=request,
+                              cache_control=Config.CACHE_CONTROL_SUPPORT_CASES)
         
     except Exception as e:
         logger.error(f"Error in get_support_cases: {str(e)}")
-        return json.dumps({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 class SupportCaseManager:
     """Manages support case operations"""
     
+    OPEN_CASES_FILTER = 'state="OPEN"'
+    
     def __init__(self):
-        client_options = ClientOptions(api_endpoint=Config.SUPPORT_API_ENDPOINT)
-        self.client = CaseServiceClient(client_options=client_options)
+        self.client = _support_client()
     
-    def get_open_cases(self, customer_id: str) -> SupportCasesResponse:
-        """Fetch all open support cases for a customer"""
-        
-        request_filter = 'state="OPEN"'
+    async def get_open_cases(self, customer_id: str) -> SupportCasesResponse:
+        """Fetch open support case counts and the first 10 open cases"""
         
         try:
-            response = self.client.list_cases(
-                parent=customer_id,
-                filter=request_filter
+            # One listing both counts every open case and keeps the first 10
+            cases_list, total_count, p1_count = await asyncio.to_thread(
+                self._scan_open_cases, customer_id
             )
             
-            cases_list = []
-            p1_count = 0
-            
-            for case in response:
-                if case.priority == 'P1':
-                    p1_count += 1
-                
-                cases_list.append(SupportCase(
-                    case_id=case.name.split('/')[-1],
-                    title=case.display_name,
-                    priority=case.priority.name if hasattr(case.priority, 'name') else str(case.priority),
-                    last_update=str(case.update_time)
-                ))
-            
-            # Limit to 10 cases for response size
             return SupportCasesResponse(
-                total_open_cases=len(cases_list),
+                total_open_cases=total_count,
                 p1_cases=p1_count,
-                cases=cases_list[:10]
+                cases=cases_list
             )
             
         except Exception as e:
             logger.error(f"Error fetching support cases: {e}")
             raise
+    
+    def _scan_open_cases(self, customer_id: str) -> tuple:
+        """Count all open cases and P1 cases, materializing only the first 10"""
+        
+        response = self.client.list_cases(
+            request={
+                "parent": customer_id,
+                "filter": self.OPEN_CASES_FILTER,
+                "page_size": 1000,
+            }
+        )
+        
+        # Limit to 10 cases for response size
+        cases_list = []
+        total_count = 0
+        p1_count = 0
+        for case in response:
+            total_count += 1
+            if case.priority == Case.Priority.P1:
+                p1_count += 1
+            if len(cases_list) < 10:
+                cases_list.append(SupportCase(
+                    case_id=case.name.split('/')[-1],
+                    title=case.display_name,
+                    priority=case.priority.name if hasattr(case.priority, 'name') else str(case.priority),
+                    last_update=str(case.update_time)
+                ))
+        
+        return cases_list, total_count, p1_count
 
 # ==========================================
 # Cloud Function: QBR Data Generation
@@ -364,67 +509,111 @@ def generate_qbr_data(request):
     """
     HTTP Cloud Function to generate QBR data.
     Request JSON: { "project_id": "project-123", "quarter": "Q3-2025" }
+    Send "Accept: application/x-ndjson" to receive each section as a
+    separate JSON line as soon as it is ready.
     """
     try:
         request_json = request.get_json(silent=True)
         if not request_json or 'project_id' not in request_json:
-            return json.dumps({"error": "Missing 'project_id'"}), 400
+            return _json_response({"error": "Missing 'project_id'"}, 400)
         
         project_id = request_json['project_id']
         quarter = request_json.get('quarter', _get_current_quarter())
         
         qbr_generator = QBRDataGenerator(project_id)
+        
+        accepted = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+        if accepted == "application/x-ndjson":
+            # Validate up front; errors can't change the status once streaming
+            QBRDataGenerator._parse_quarter(quarter)
+            
+            def generate():
+                yield orjson.dumps({"project_id": project_id, "quarter": quarter}) + b"\n"
+                # A failed section is reported in-band; the status is already sent
+                for section, value in qbr_generator.iter_qbr_sections(quarter, return_exceptions=True):
+                    if isinstance(value, Exception):
+                        logger.error(f"Error generating QBR section {section}: {value}")
+                        yield orjson.dumps({"section": section, "error": str(value)}) + b"\n"
+                    else:
+                        yield orjson.dumps({"section": section, "data": value}) + b"\n"
+            
+            return Response(
+                stream_with_context(generate()),
+                mimetype="application/x-ndjson",
+                headers={"Cache-Control": Config.CACHE_CONTROL_QBR, "Vary": "Accept"},
+            )
+        
         qbr_data = qbr_generator.generate_qbr_metrics(quarter)
         
-        return json.dumps(asdict(qbr_data)), 200
+        return _json_response(qbr_data, request=request,
+                              cache_control=Config.CACHE_CONTROL_QBR, vary="Accept")
         
     except Exception as e:
         logger.error(f"Error in generate_qbr_data: {str(e)}")
-        return json.dumps({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
+
+# (start_month, end_month) for Q1..Q4
+_QUARTER_MONTHS = ((1, 3), (4, 6), (7, 9), (10, 12))
 
 class QBRDataGenerator:
     """Generates comprehensive QBR metrics"""
     
     def __init__(self, project_id: str):
         self.project_id = project_id
-        self.bq_client = bigquery.Client()
+        self.bq_client = _bq_client()
     
     def generate_qbr_metrics(self, quarter: str) -> QBRMetrics:
         """Generate all QBR metrics for a given quarter"""
         
-        start_date, end_date = self._parse_quarter(quarter)
-        
-        # Get cost metrics
-        total_cost, cost_trend = self._get_cost_metrics(start_date, end_date)
-        
-        # Get top services by cost
-        top_services = self._get_top_services(start_date, end_date)
-        
-        # Get usage highlights
-        usage_highlights = self._get_usage_highlights(start_date, end_date)
-        
-        # Get recommendations
-        recommendations = self._get_quarterly_recommendations()
+        sections = dict(self.iter_qbr_sections(quarter))
+        cost_metrics = sections["cost_metrics"]
         
         return QBRMetrics(
             project_id=self.project_id,
             quarter=quarter,
-            total_cost=total_cost,
-            cost_trend=cost_trend,
-            top_services=top_services,
-            recommendations=recommendations,
-            usage_highlights=usage_highlights
+            total_cost=cost_metrics["total_cost"],
+            cost_trend=cost_metrics["cost_trend"],
+            top_services=sections["top_services"],
+            recommendations=sections["recommendations"],
+            usage_highlights=sections["usage_highlights"]
         )
     
-    def _get_cost_metrics(self, start_date: datetime, end_date: datetime) -> tuple:
-        """Calculate total cost and trend for the quarter"""
+    def iter_qbr_sections(self, quarter: str, return_exceptions: bool = False) -> Iterator[Tuple[str, Any]]:
+        """
+        Compute QBR sections concurrently, yielding each as it completes.
+        With return_exceptions, a failed section yields its exception instead of raising.
+        """
+        
+        start_date, end_date = self._parse_quarter(quarter)
+        
+        sections = {
+            "cost_metrics": (self._get_cost_metrics, start_date, end_date),
+            "top_services": (self._get_top_services, start_date, end_date),
+            "usage_highlights": (self._get_usage_highlights, start_date, end_date),
+            "recommendations": (self._get_quarterly_recommendations,),
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {
+                executor.submit(func, *args): name
+                for name, (func, *args) in sections.items()
+            }
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is not None and return_exceptions:
+                    yield futures[future], error
+                else:
+                    yield futures[future], future.result()
+    
+    def _get_cost_metrics(self, start_date: datetime, end_date: datetime) -> Dict[str, float]:
+        """Calculate total cost and trend for the quarter, named as in QBRMetrics"""
         
         query = f"""
         WITH quarterly_costs AS (
             SELECT 
                 DATE_TRUNC(usage_date, QUARTER) as quarter,
-                SUM(cost) as total_cost
-            FROM `{Config.TABLE_COST_USAGE}`
+                SUM(total_cost) as total_cost
+            FROM `{Config.TABLE_PROJECT_COST_DAILY}`
             WHERE project_id = @project_id
                 AND usage_date BETWEEN DATE_SUB(@start_date, INTERVAL 3 MONTH) AND @end_date
             GROUP BY quarter
@@ -437,29 +626,26 @@ class QBRDataGenerator:
         FROM quarterly_costs
         """
         
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("project_id", "STRING", self.project_id),
-                bigquery.ScalarQueryParameter("start_date", "DATE", start_date.date()),
-                bigquery.ScalarQueryParameter("end_date", "DATE", end_date.date()),
-            ]
-        )
+        query_parameters = [
+            bigquery.ScalarQueryParameter("project_id", "STRING", self.project_id),
+            bigquery.ScalarQueryParameter("start_date", "DATE", start_date.date()),
+            bigquery.ScalarQueryParameter("end_date", "DATE", end_date.date()),
+        ]
         
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            results = list(query_job.result())
+            results = _cached_query(self.bq_client, query, query_parameters)
             
-            if results:
-                current_cost = results[0].total_cost
-                prev_cost = results[0].prev_quarter_cost if len(results) > 0 and results[0].prev_quarter_cost else current_cost
+            if results.num_rows:
+                current_cost = results.column("total_cost")[0].as_py()
+                prev_cost = results.column("prev_quarter_cost")[0].as_py() or current_cost
                 trend = ((current_cost - prev_cost) / prev_cost * 100) if prev_cost > 0 else 0
-                return current_cost, round(trend, 2)
+                return {"total_cost": current_cost, "cost_trend": round(trend, 2)}
             
-            return 0.0, 0.0
+            return {"total_cost": 0.0, "cost_trend": 0.0}
             
         except Exception as e:
             logger.error(f"Error getting cost metrics: {e}")
-            return 0.0, 0.0
+            return {"total_cost": 0.0, "cost_trend": 0.0}
     
     def _get_top_services(self, start_date: datetime, end_date: datetime) -> List[Dict[str, float]]:
         """Get top 5 services by cost"""
@@ -476,21 +662,21 @@ class QBRDataGenerator:
         LIMIT 5
         """
         
-        job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("project_id", "STRING", self.project_id),
-                bigquery.ScalarQueryParameter("start_date", "DATE", start_date.date()),
-                bigquery.ScalarQueryParameter("end_date", "DATE", end_date.date()),
-            ]
-        )
+        query_parameters = [
+            bigquery.ScalarQueryParameter("project_id", "STRING", self.project_id),
+            bigquery.ScalarQueryParameter("start_date", "DATE", start_date.date()),
+            bigquery.ScalarQueryParameter("end_date", "DATE", end_date.date()),
+        ]
         
         try:
-            query_job = self.bq_client.query(query, job_config=job_config)
-            results = query_job.result()
+            results = _cached_query(self.bq_client, query, query_parameters)
+            
+            services = results.column("service_name").to_pylist()
+            costs = results.column("total_cost").to_pylist()
             
             return [
-                {"service": row.service_name, "cost": row.total_cost}
-                for row in results
+                {"service": service, "cost": cost}
+                for service, cost in zip(services, costs)
             ]
             
         except Exception as e:
@@ -500,13 +686,21 @@ class QBRDataGenerator:
     def _get_usage_highlights(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """Get key usage highlights for the quarter"""
         
-        highlights = {
-            "compute_instances": self._count_compute_instances(),
-            "storage_gb": self._get_storage_usage(),
-            "api_calls": self._get_api_call_volume(start_date, end_date),
-            "active_services": self._count_active_services(start_date, end_date)
+        fetches = {
+            "compute_instances": (self._count_compute_instances,),
+            "storage_gb": (self._get_storage_usage,),
+            "api_calls": (self._get_api_call_volume, start_date, end_date),
+            "active_services": (self._count_active_services, start_date, end_date)
         }
         
+        # Each highlight comes from a different API; fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(fetches)) as executor:
+            futures = {
+                name: executor.submit(func, *args)
+                for name, (func, *args) in fetches.items()
+            }
+            highlights = {name: future.result() for name, future in futures.items()}
+        
         return highlights
     
     def _get_quarterly_recommendations(self) -> List[str]:
@@ -522,26 +716,19 @@ class QBRDataGenerator:
         
         return recommendations[:3]  # Top 3 recommendations
     
-    def _parse_quarter(self, quarter: str) -> tuple:
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _parse_quarter(quarter: str) -> tuple:
         """Parse quarter string to date range"""
         # Format: Q3-2025
         q_num = int(quarter[1])
         year = int(quarter.split('-')[1])
+        if not 1 <= q_num <= 4:
+            raise ValueError(f"Invalid quarter: {quarter}")
         
-        quarter_months = {
-            1: (1, 3),
-            2: (4, 6),
-            3: (7, 9),
-            4: (10, 12)
-        }
-        
-        start_month, end_month = quarter_months[q_num]
+        start_month, end_month = _QUARTER_MONTHS[q_num - 1]
         start_date = datetime(year, start_month, 1)
-        
-        if end_month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, end_month + 1, 1) - timedelta(days=1)
+        end_date = datetime(year, end_month, calendar.monthrange(year, end_month)[1])
         
         return start_date, end_date
     
@@ -575,130 +762,252 @@ def _get_current_quarter() -> str:
 # Vertex AI Agent Configuration
 # ==========================================
 
+TAM_COPILOT_SYSTEM_PROMPT = """
+You are 'TAM Co-Pilot,' an expert Google Cloud Technical Account Manager assistant. 
+Your purpose is to provide data-driven, accurate, and concise information to help TAMs.
+
+Guidelines:
+- When asked for a summary or report, use multiple tools if necessary to gather all relevant information
+- Always state the project ID and timeframe you are reporting on
+- Never provide information you cannot verify with a tool
+- For technical questions, use the 'answer_technical_question' tool
+- Be concise but comprehensive in your responses
+"""
+
+# Tool declarations are immutable, so build them once at import time
+
+# Tool 1: Platform Health Check
+_health_check_func = FunctionDeclaration(
+    name="get_platform_health",
+    description="Retrieves a summary of a project's performance, cost, and security posture",
+    parameters={
+        "type": "object",
+        "properties": {
+            "project_id": {
+                "type": "string",
+                "description": "The GCP project ID to check"
+            },
+            "time_period_days": {
+                "type": "integer",
+                "description": "Number of days to analyze (default: 7)"
+            }
+        },
+        "required": ["project_id"]
+    }
+)
+
+# Tool 2: Support Cases
+_support_cases_func = FunctionDeclaration(
+    name="get_open_support_cases",
+    description="Fetches list and status of open support cases for a customer",
+    parameters={
+        "type": "object",
+        "properties": {
+            "customer_account_id": {
+                "type": "string",
+                "description": "The customer account ID (format: customers/12345)"
+            }
+        },
+        "required": ["customer_account_id"]
+    }
+)
+
+# Tool 3: QBR Data
+_qbr_data_func = FunctionDeclaration(
+    name="generate_qbr_data",
+    description="Gathers key metrics for quarterly business reviews",
+    parameters={
+        "type": "object",
+        "properties": {
+            "project_id": {
+                "type": "string",
+                "description": "The GCP project ID"
+            },
+            "quarter": {
+                "type": "string",
+                "description": "Quarter to analyze (format: Q3-2025)"
+            }
+        },
+        "required": ["project_id"]
+    }
+)
+
+# Tool 4: Technical Questions (RAG)
+# Vertex rejects a request that mixes function declarations with a retrieval
+# tool, so retrieval stays a function call that runs rag.retrieval_query.
+_tech_question_func = FunctionDeclaration(
+    name="answer_technical_question",
+    description="Searches knowledge base to answer technical questions about Google Cloud",
+    parameters={
+        "type": "object",
+        "properties": {
+            "question": {
+                "type": "string",
+                "description": "The technical question to answer"
+            }
+        },
+        "required": ["question"]
+    }
+)
+
+_FUNCTION_TOOLS = Tool(
+    function_declarations=[
+        _health_check_func,
+        _support_cases_func,
+        _qbr_data_func,
+        _tech_question_func
+    ]
+)
+
+@functools.lru_cache(maxsize=1)
+def _inline_model() -> generative_models.GenerativeModel:
+    """Shared model handle used when the context cache is unavailable"""
+    # Built lazily so that vertexai.init() has already run
+    return generative_models.GenerativeModel(
+        Config.VERTEX_AI_MODEL,
+        system_instruction=TAM_COPILOT_SYSTEM_PROMPT,
+    )
+
 class TAMCopilotAgent:
     """Main orchestrator for the TAM Co-Pilot Agent"""
     
     def __init__(self):
         vertexai.init(project=Config.PROJECT_ID, location=Config.REGION)
-        self.model = generative_models.GenerativeModel(Config.VERTEX_AI_MODEL)
         self._setup_tools()
+        self._load_model()
     
-    def _setup_tools(self):
-        """Configure all tools for the agent"""
+    def _load_model(self):
+        """Register the static system prompt and tools in the context cache"""
         
-        # Tool 1: Platform Health Check
-        health_check_func = FunctionDeclaration(
-            name="get_platform_health",
-            description="Retrieves a summary of a project's performance, cost, and security posture",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "project_id": {
-                        "type": "string",
-                        "description": "The GCP project ID to check"
-                    },
-                    "time_period_days": {
-                        "type": "integer",
-                        "description": "Number of days to analyze (default: 7)"
-                    }
-                },
-                "required": ["project_id"]
-            }
-        )
+        self.cache = None
+        self.model = _inline_model()
+        if not Config.CONTEXT_CACHE_ENABLED:
+            return
         
-        # Tool 2: Support Cases
-        support_cases_func = FunctionDeclaration(
-            name="get_open_support_cases",
-            description="Fetches list and status of open support cases for a customer",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "customer_account_id": {
-                        "type": "string",
-                        "description": "The customer account ID (format: customers/12345)"
-                    }
-                },
-                "required": ["customer_account_id"]
-            }
-        )
+        try:
+            cache = caching.CachedContent.create(
+                model_name=Config.VERTEX_AI_MODEL,
+                system_instruction=TAM_COPILOT_SYSTEM_PROMPT,
+                tools=[self.tools],
+                ttl=Config.CONTEXT_CACHE_TTL,
+            )
+            self.model = GenerativeModel.from_cached_content(cached_content=cache)
+            self.cache = cache
+        except Exception as e:
+            # Context caching has a minimum prefix size and is not available
+            # for every model version; send the preamble inline instead.
+            logger.warning(f"Context cache unavailable, sending system prompt inline: {e}")
+    
+    def _refresh_context_cache(self):
+        """Extend or recreate the context cache when it is close to expiring"""
         
-        # Tool 3: QBR Data
-        qbr_data_func = FunctionDeclaration(
-            name="generate_qbr_data",
-            description="Gathers key metrics for quarterly business reviews",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "project_id": {
-                        "type": "string",
-                        "description": "The GCP project ID"
-                    },
-                    "quarter": {
-                        "type": "string",
-                        "description": "Quarter to analyze (format: Q3-2025)"
-                    }
-                },
-                "required": ["project_id"]
-            }
-        )
+        if self.cache is None:
+            return
         
-        # Tool 4: Technical Questions (RAG)
-        tech_question_func = FunctionDeclaration(
-            name="answer_technical_question",
-            description="Searches knowledge base to answer technical questions about Google Cloud",
-            parameters={
-                "type": "object",
-                "properties": {
-                    "question": {
-                        "type": "string",
-                        "description": "The technical question to answer"
-                    }
-                },
-                "required": ["question"]
-            }
-        )
+        remaining = self.cache.expire_time - datetime.now(timezone.utc)
+        if remaining <= timedelta(0):
+            self._load_model()
+        elif remaining < Config.CONTEXT_CACHE_REFRESH_MARGIN:
+            self.cache.update(ttl=Config.CONTEXT_CACHE_TTL)
+    
+    def close(self):
+        """Delete the context cache so it stops accruing storage cost"""
         
-        self.tools = Tool(
-            function_declarations=[
-                health_check_func,
-                support_cases_func,
-                qbr_data_func,
-                tech_question_func
-            ]
-        )
+        if self.cache is not None:
+            self.cache.delete()
+            self.cache = None
     
-    def process_request(self, user_prompt: str) -> str:
-        """Process a user request and return response"""
+    def _setup_tools(self):
+        """Configure all tools for the agent"""
         
-        # System prompt
-        system_prompt = """
-        You are 'TAM Co-Pilot,' an expert Google Cloud Technical Account Manager assistant. 
-        Your purpose is to provide data-driven, accurate, and concise information to help TAMs.
-        
-        Guidelines:
-        - When asked for a summary or report, use multiple tools if necessary to gather all relevant information
-        - Always state the project ID and timeframe you are reporting on
-        - Never provide information you cannot verify with a tool
-        - For technical questions, use the 'answer_technical_question' tool
-        - Be concise but comprehensive in your responses
-        """
+        self.tools = _FUNCTION_TOOLS
+    
+    async def process_request(self, user_prompt: str) -> str:
+        """Process a user request and return response"""
         
         try:
-            # Generate response with tools
-            response = self.model.generate_content(
-                [system_prompt, user_prompt],
-                tools=[self.tools],
-                generation_config={
-                    "temperature": 0.1,
-                    "max_output_tokens": 2048,
-                }
-            )
+            self._refresh_context_cache()
+            
+            contents = [Content(role="user", parts=[Part.from_text(user_prompt)])]
+            
+            for _ in range(Config.MAX_TOOL_TURNS):
+                # System prompt and tools are part of the cached context; only
+                # pass them explicitly when the cache is unavailable.
+                response = await self.model.generate_content_async(
+                    contents,
+                    tools=None if self.cache else [self.tools],
+                    generation_config={
+                        "temperature": 0.1,
+                        "max_output_tokens": 2048,
+                    }
+                )
+                
+                candidate = response.candidates[0]
+                if not candidate.function_calls:
+                    return response.text
+                
+                # Independent tool calls from the same turn run concurrently
+                semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_TOOL_CALLS)
+                results = await asyncio.gather(*(
+                    self._dispatch_tool_async(function_call, semaphore)
+                    for function_call in candidate.function_calls
+                ))
+                
+                contents.append(candidate.content)
+                contents.append(Content(role="user", parts=[
+                    Part.from_function_response(name=function_call.name, response=result)
+                    for function_call, result in zip(candidate.function_calls, results)
+                ]))
             
-            return response.text
+            logger.warning(f"Stopped after {Config.MAX_TOOL_TURNS} tool-calling turns")
+            return "I could not complete your request within the allowed number of tool calls."
             
         except Exception as e:
             logger.error(f"Error processing request: {e}")
             return f"I encountered an error processing your request: {str(e)}"
+    
+    async def _dispatch_tool_async(self, function_call, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Execute a single tool call requested by the model"""
+        
+        name = function_call.name
+        args = dict(function_call.args)
+        
+        async with semaphore:
+            try:
+                if name == "get_platform_health":
+                    health_checker = PlatformHealthChecker(args["project_id"])
+                    health_summary = await health_checker.check_health(int(args.get("time_period_days", 7)))
+                    result = PlatformHealthResponse(
+                        project_id=args["project_id"],
+                        health_summary=health_summary
+                    )
+                elif name == "get_open_support_cases":
+                    case_manager = SupportCaseManager()
+                    result = await case_manager.get_open_cases(args["customer_account_id"])
+                elif name == "generate_qbr_data":
+                    qbr_generator = QBRDataGenerator(args["project_id"])
+                    quarter = args.get("quarter") or _get_current_quarter()
+                    result = await asyncio.to_thread(qbr_generator.generate_qbr_metrics, quarter)
+                elif name == "answer_technical_question":
+                    return await asyncio.to_thread(self._answer_technical_question, args["question"])
+                else:
+                    return {"error": f"Unknown tool '{name}'"}
+                
+                return asdict(result)
+                
+            except Exception as e:
+                logger.error(f"Error executing tool {name}: {e}")
+                return {"error": str(e)}
+    
+    def _answer_technical_question(self, question: str) -> Dict[str, Any]:
+        """Retrieve relevant knowledge base passages for a question"""
+        
+        response = rag.retrieval_query(
+            rag_resources=[rag.RagResource(rag_corpus=Config.RAG_CORPUS)],
+            text=question,
+            similarity_top_k=3,
+        )
+        return {"contexts": [context.text for context in response.contexts.contexts]}
 
 # ==========================================
 # Data Ingestion Functions (Scheduled)
@@ -713,27 +1022,43 @@ def daily_data_aggregation(request):
     try:
         aggregator = DataAggregator()
         
-        # Run various aggregation tasks
-        aggregator.aggregate_cost_data()
-        aggregator.update_support_case_history()
-        aggregator.compute_usage_metrics()
+        # Run all aggregation tasks as a single BigQuery script
+        aggregator.run_aggregations()
         
-        return json.dumps({"status": "success", "timestamp": datetime.now().isoformat()}), 200
+        return _json_response({"status": "success", "timestamp": datetime.now()})
         
     except Exception as e:
         logger.error(f"Error in daily aggregation: {str(e)}")
-        return json.dumps({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 class DataAggregator:
     """Handles all data aggregation tasks"""
     
     def __init__(self):
-        self.bq_client = bigquery.Client()
+        self.bq_client = _bq_client()
     
-    def aggregate_cost_data(self):
-        """Aggregate billing export data into daily summary"""
+    def run_aggregations(self):
+        """Submit every aggregation statement as one multi-statement job"""
         
-        query = f"""
+        statements = [
+            self.aggregate_cost_data(),
+            self.update_support_case_history(),
+            self.compute_usage_metrics(),
+        ]
+        script = ";\n".join(stmt.strip() for stmt in statements if stmt)
+        
+        try:
+            query_job = self.bq_client.query(script)
+            query_job.result()
+            logger.info("Successfully ran daily aggregation script")
+        except Exception as e:
+            logger.error(f"Failed to run daily aggregation script: {e}")
+            raise
+    
+    def aggregate_cost_data(self) -> str:
+        """SQL to aggregate billing export data into daily summaries"""
+        
+        return f"""
         INSERT INTO `{Config.TABLE_COST_USAGE}` (project_id, usage_date, service_name, cost, usage_amount)
         SELECT 
             project.id as project_id,
@@ -743,52 +1068,85 @@ class DataAggregator:
             SUM(usage.amount) as usage_amount
         FROM `{Config.PROJECT_ID}.billing.gcp_billing_export_v1`
         WHERE DATE(usage_start_time) = CURRENT_DATE() - 1
-        GROUP BY project_id, usage_date, service_name
-        """
+        GROUP BY project_id, usage_date, service_name;
         
-        try:
-            query_job = self.bq_client.query(query)
-            query_job.result()
-            logger.info("Successfully aggregated cost data")
-        except Exception as e:
-            logger.error(f"Failed to aggregate cost data: {e}")
-            raise
+        -- Per-project rollup read by the cost trend queries
+        CREATE TABLE IF NOT EXISTS `{Config.TABLE_PROJECT_COST_DAILY}` (
+            project_id STRING,
+            usage_date DATE,
+            total_cost FLOAT64
+        )
+        PARTITION BY usage_date
+        CLUSTER BY project_id;
+        
+        -- One-time backfill of every earlier day while the rollup is still empty
+        IF NOT EXISTS (SELECT 1 FROM `{Config.TABLE_PROJECT_COST_DAILY}` LIMIT 1) THEN
+            INSERT INTO `{Config.TABLE_PROJECT_COST_DAILY}` (project_id, usage_date, total_cost)
+            SELECT 
+                project_id,
+                usage_date,
+                SUM(cost) as total_cost
+            FROM `{Config.TABLE_COST_USAGE}`
+            WHERE usage_date < CURRENT_DATE() - 1
+            GROUP BY project_id, usage_date;
+        END IF;
+        
+        INSERT INTO `{Config.TABLE_PROJECT_COST_DAILY}` (project_id, usage_date, total_cost)
+        SELECT 
+            project_id,
+            usage_date,
+            SUM(cost) as total_cost
+        FROM `{Config.TABLE_COST_USAGE}`
+        WHERE usage_date = CURRENT_DATE() - 1
+        GROUP BY project_id, usage_date
+        """
     
-    def update_support_case_history(self):
-        """Update support case history table"""
+    def update_support_case_history(self) -> Optional[str]:
+        """SQL to update support case history table"""
         
         # This would typically fetch from Support API and update BigQuery
         # Simplified for this implementation
-        logger.info("Support case history updated")
+        return None
     
-    def compute_usage_metrics(self):
-        """Compute various usage metrics"""
+    def compute_usage_metrics(self) -> Optional[str]:
+        """SQL to compute various usage metrics"""
         
         # Additional metrics computation
-        logger.info("Usage metrics computed")
+        return None
 
 # ==========================================
 # Main Application Entry Point
 # ==========================================
 
+# Example interactions
+TEST_PROMPTS: Tuple[str, ...] = (
+    "Give me a health check for project-abc for the last 7 days",
+    "What are the open P1 support cases for customers/12345?",
+    "Generate QBR data for project-xyz for Q3-2025",
+    "What are the best practices for setting up Cloud Run?",
+)
+
+async def _run_test_prompts(agent: TAMCopilotAgent, prompts: Tuple[str, ...]):
+    """Send the test prompts to the agent concurrently and print the exchanges"""
+    
+    responses = await asyncio.gather(*(agent.process_request(prompt) for prompt in prompts))
+    
+    # Build the whole transcript once and write it in a single call
+    separator = "-" * 80
+    sys.stdout.write("".join(
+        f"\n📝 User: {prompt}\n🤖 TAM Co-Pilot: {response}\n\n{separator}\n"
+        for prompt, response in zip(prompts, responses)
+    ))
+
 def main():
     """Main entry point for testing the agent locally"""
     
     agent = TAMCopilotAgent()
     
-    # Example interactions
-    test_prompts = [
-        "Give me a health check for project-abc for the last 7 days",
-        "What are the open P1 support cases for customers/12345?",
-        "Generate QBR data for project-xyz for Q3-2025",
-        "What are the best practices for setting up Cloud Run?"
-    ]
-    
-    for prompt in test_prompts:
-        print(f"\n📝 User: {prompt}")
-        response = agent.process_request(prompt)
-        print(f"🤖 TAM Co-Pilot: {response}\n")
-        print("-" * 80)
+    try:
+        asyncio.run(_run_test_prompts(agent, TEST_PROMPTS))
+    finally:
+        agent.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
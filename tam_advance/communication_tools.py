@@ -1,22 +1,37 @@
+import logging
+
 from adk.api.tools import tool
 
+logger = logging.getLogger(__name__)
+
 @tool
 def gmail_draft_tool(recipient: str, subject: str, body: str) -> str:
     """
     Creates a draft email in Gmail.
     In a real implementation, this would use the Gmail API.
     """
-    print(f"TOOL: Creating Gmail draft for '{recipient}' with subject '{subject}'...")
+    logger.debug("TOOL: Creating Gmail draft for '%s' with subject '%s'...", recipient, subject)
     # Mock implementation
     return f"Successfully created email draft for '{recipient}'."
 
+@tool
+def gmail_draft_batch_tool(drafts: list[dict]) -> list[str]:
+    """
+    Creates several Gmail drafts in one request.
+    Each draft is an object of the form {"recipient": ..., "subject": ..., "body": ...}.
+    In a real implementation, this would add every draft to one Gmail API batch request.
+    """
+    logger.debug("TOOL: Creating %d Gmail drafts in one batch...", len(drafts))
+    # Mock implementation
+    return [f"Successfully created email draft for '{draft['recipient']}'." for draft in drafts]
+
 @tool
 def google_chat_tool(message: str) -> str:
     """
     Sends a notification to a pre-configured Google Chat room via webhook.
     In a real implementation, this would make an HTTP POST request to the webhook URL.
     """
-    print(f"TOOL: Sending Google Chat notification: '{message}'...")
+    logger.debug("TOOL: Sending Google Chat notification: '%s'...", message)
     # Mock implementation
     return "Successfully sent notification to incident channel."
 
@@ -27,7 +42,7 @@ def google_slides_tool(customer_name: str, usage_data: str, crm_data: str) -> st
     It populates the slides with the provided data.
     In a real implementation, this would use the Google Slides API.
     """
-    print(f"TOOL: Generating QBR presentation for '{customer_name}'...")
+    logger.debug("TOOL: Generating QBR presentation for '%s'...", customer_name)
     # Mock implementation
     slide_url = "https://docs.google.com/presentation/d/1aBcDeFgHiJkLmNoPqRsTuVwXyZ/edit"
     return f"Successfully created QBR presentation. Link: {slide_url}"
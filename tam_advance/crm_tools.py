@@ -1,12 +1,24 @@
+import functools
+import logging
+import threading
+from concurrent.futures import Executor, Future
+
 from adk.api.tools import tool
 
+logger = logging.getLogger(__name__)
+
+# Profile lookups started before the agent asks for them, keyed by the exact
+# customer name passed to _lookup_customer_profile, since the profile depends on it
+_speculative_profiles: dict[str, Future] = {}
+_speculative_lock = threading.Lock()
+
 @tool
 def create_case_tool(customer_name: str, priority: str, summary: str) -> str:
     """
     Creates a new support case in the case management system (e.g., Salesforce, Jira).
     In a real implementation, this would call the CRM's API.
     """
-    print(f"TOOL: Creating new {priority} case for '{customer_name}' with summary: '{summary}'...")
+    logger.debug("TOOL: Creating new %s case for '%s' with summary: '%s'...", priority, customer_name, summary)
     # Mock implementation
     case_id = "CASE-8675309"
     return f"Successfully created new support case. Case ID: {case_id}"
@@ -18,7 +30,52 @@ def get_customer_profile_tool(customer_name: str) -> str:
     This includes their business goals, tech stack, and key contacts.
     In a real implementation, this would call the CRM's API.
     """
-    print(f"TOOL: Retrieving CRM profile for '{customer_name}'...")
+    logger.debug("TOOL: Retrieving CRM profile for '%s'...", customer_name)
+    with _speculative_lock:
+        speculative = _speculative_profiles.pop(customer_name, None)
+    if speculative is not None:
+        return speculative.result()
+    return _lookup_customer_profile(customer_name)
+
+@tool
+def get_customer_profiles_tool(customer_names: list[str]) -> dict[str, str]:
+    """
+    Retrieves the CRM profiles of several customers at once, keyed by customer name.
+    Use this instead of calling get_customer_profile_tool once per customer.
+    In a real implementation, this would be a single CRM query filtered on all of the names.
+    """
+    logger.debug("TOOL: Retrieving CRM profiles for %d customers...", len(customer_names))
+    # Mock implementation
+    return {name: _lookup_customer_profile(name) for name in dict.fromkeys(customer_names)}
+
+def prefetch_customer_profile(customer_name: str, executor: Executor) -> Future:
+    """
+    Starts a profile lookup ahead of the agent's first tool call.
+    get_customer_profile_tool picks up the result if it is asked for the same customer.
+    """
+    with _speculative_lock:
+        future = _speculative_profiles.get(customer_name)
+        if future is None:
+            future = executor.submit(_lookup_customer_profile, customer_name)
+            _speculative_profiles[customer_name] = future
+    return future
+
+def discard_customer_profile(customer_name: str, future: Future):
+    """Drops a speculative lookup the agent never used, cancelling it if it has not started."""
+    with _speculative_lock:
+        if _speculative_profiles.get(customer_name) is not future:
+            # Already claimed by a tool call, possibly from another scenario
+            # that shares this future; it must still complete.
+            return
+        del _speculative_profiles[customer_name]
+    future.cancel()
+
+@functools.lru_cache(maxsize=512)
+def _lookup_customer_profile(customer_name: str) -> str:
+    """
+    Cached CRM profile lookup; profiles are deterministic per customer name.
+    Call _lookup_customer_profile.cache_clear() to drop cached profiles.
+    """
     # Mock implementation
     if "Z" in customer_name:
          return "Customer 'Z' Profile:\n- Industry: Finance\n- Stated Goal: Reduce data processing costs by 20%.\n- Current Stack: Heavy use of self-managed Postgres on GCE, BigQuery."
@@ -1,5 +1,9 @@
+import logging
+
 from adk.api.tools import tool
 
+logger = logging.getLogger(__name__)
+
 @tool
 def gcp_monitoring_tool(customer_project_id: str) -> str:
     """
@@ -7,7 +11,7 @@ def gcp_monitoring_tool(customer_project_id: str) -> str:
     Identifies services with high latency, error rates, or saturation.
     In a real implementation, this would call the Cloud Monitoring API.
     """
-    print(f"TOOL: Analyzing monitoring data for project '{customer_project_id}'...")
+    logger.debug("TOOL: Analyzing monitoring data for project '%s'...", customer_project_id)
     # Mock implementation
     return (
         "Analysis Complete:\n"
@@ -22,7 +26,7 @@ def gcp_billing_tool(customer_project_id: str) -> str:
     Analyzes Google Cloud Billing data for cost-saving opportunities.
     In a real implementation, this would call the Cloud Billing API.
     """
-    print(f"TOOL: Analyzing billing data for project '{customer_project_id}'...")
+    logger.debug("TOOL: Analyzing billing data for project '%s'...", customer_project_id)
     # Mock implementation
     return (
         "Analysis Complete:\n"
@@ -37,7 +41,7 @@ def gcp_usage_tool(customer_project_id: str) -> str:
     Used for QBR preparation.
     In a real implementation, this would query billing export data or usage APIs.
     """
-    print(f"TOOL: Gathering quarterly usage data for project '{customer_project_id}'...")
+    logger.debug("TOOL: Gathering quarterly usage data for project '%s'...", customer_project_id)
     # Mock implementation
     return (
         "Quarterly Usage Data:\n"
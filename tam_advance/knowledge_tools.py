@@ -1,5 +1,10 @@
+import functools
+import logging
+
 from adk.api.tools import tool
 
+logger = logging.getLogger(__name__)
+
 @tool
 def internal_knowledge_search_tool(query: str) -> str:
     """
@@ -7,16 +12,26 @@ def internal_knowledge_search_tool(query: str) -> str:
     This is a Retrieval-Augmented Generation (RAG) tool.
     In a real implementation, this would use the Google Drive API to search and extract text.
     """
-    print(f"TOOL: Searching knowledge base for '{query}'...")
+    logger.debug("TOOL: Searching knowledge base for '%s'...", query)
+    # Normalize so trivially different phrasings share a cache entry
+    normalized_query = " ".join(query.lower().split())
+    return _search_knowledge_base(normalized_query)
+
+@functools.lru_cache(maxsize=512)
+def _search_knowledge_base(normalized_query: str) -> str:
+    """
+    Cached search over the knowledge base, keyed on the normalized query.
+    Call _search_knowledge_base.cache_clear() to drop cached results.
+    """
     # Mock implementation based on the query
-    if "database latency" in query:
+    if "database latency" in normalized_query:
         return (
             "Found one relevant post-mortem document: 'PM-2024-08-15-Database-Hotspotting'.\n"
             "Summary: A previous incident was caused by a misconfigured connection pool, "
             "leading to lock contention. Recommended action was to implement exponential backoff "
             "and increase the pool size."
         )
-    if "Postgres" in query:
+    if "postgres" in normalized_query:
          return (
             "Found internal document 'AlloyDB Omni for Postgres - Customer Fit Guide'.\n"
             "Ideal customers are those running self-managed PostgreSQL on VMs, "
@@ -1,56 +1,41 @@
 import os
-import time
+import asyncio
+import logging
 from dotenv import load_dotenv
 
 from adk.api import agents
-from agent import create_tam_super_agent
-
-def run_agent_scenario(agent: agents.Agent, prompt: str, scenario_title: str):
-    """Helper function to run and print a single agent scenario."""
-    print("=" * 60)
-    print(f"🎬 SCENARIO: {scenario_title}")
-    print(f"👤 TAM PROMPT: \"{prompt}\"")
-    print("-" * 60)
-    
-    start_time = time.time()
-    response = agent.run(prompt)
-    end_time = time.time()
-    
-    print("\n" + "-" * 20 + " AGENT FINAL SUMMARY " + "-" * 20)
-    print(response)
-    print(f"\n✅ SCENARIO COMPLETE (Execution time: {end_time - start_time:.2f} seconds)")
-    print("=" * 60 + "\n\n")
 
+from ._runner import print_scenario_result, run_all_scenarios
+from .agent import create_tam_super_agent
+from .scenarios import SCENARIOS
 
-# --- Main Execution Logic ---
-if __name__ == "__main__":
+async def _main(agent: agents.Agent, scenarios):
+    """Runs all scenarios, then prints their reports in order."""
+    # Scenarios run concurrently; reports are printed once all have finished
+    # so their output does not interleave.
+    results = await run_all_scenarios(agent, scenarios)
+
+    pause = bool(os.getenv("DEMO_PAUSE"))
+    for index, result in enumerate(results):
+        if pause and index:
+            await asyncio.sleep(2) # Pause between reports for readability
+        print_scenario_result(*result)
+
+
+def main():
+    """Command-line entry point that runs the demo scenarios."""
     load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     print("🚀 Initializing Professional TAM Super-Agent...")
-    
+
     # In a real application, this might be a web server or a Pub/Sub listener.
     # Here, we will run a series of predefined prompts to demonstrate capabilities.
     tam_agent = create_tam_super_agent()
     print("✅ Agent Initialized.")
 
-    prompts_to_run = [
-        {
-            "title": "Proactive Health & Optimization",
-            "prompt": "Run a proactive health and cost check for Customer X and draft an email to the internal engineering team with the findings."
-        },
-        {
-            "title": "Issue & Escalation Management",
-            "prompt": "We have a P1 incident for Customer Y regarding 'database latency'. Create a support case, notify the incident chat room, and check our knowledge base for post-mortems on similar issues."
-        },
-        {
-            "title": "Strategic Roadmap & QBR",
-            "prompt": "Prepare the Q2 2026 QBR deck for Customer Z."
-        },
-        {
-            "title": "New Product Adoption & Launch Planning",
-            "prompt": "A new service, 'AlloyDB Omni for Postgres', was just announced. Identify which of my customers are heavy Postgres users and draft an introductory email for them."
-        }
-    ]
-
-    for scenario in prompts_to_run:
-        run_agent_scenario(tam_agent, scenario["prompt"], scenario["title"])
-        time.sleep(2) # Pause between scenarios for readability
+    asyncio.run(_main(tam_agent, SCENARIOS))
+
+
+# --- Main Execution Logic ---
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from adk.api.tools import tool
+
+from .gcp_tools import gcp_monitoring_tool, gcp_billing_tool, gcp_usage_tool
+from .crm_tools import create_case_tool, get_customer_profile_tool, get_customer_profiles_tool
+from .communication_tools import gmail_draft_tool, gmail_draft_batch_tool, google_chat_tool, google_slides_tool
+from .knowledge_tools import internal_knowledge_search_tool
+
+logger = logging.getLogger(__name__)
+
+# Shared by every scenario so concurrent runs don't each spin up threads
+tool_executor = ThreadPoolExecutor(max_workers=8)
+
+# Every domain tool; each may also be grouped into a single parallel step
+GROUPABLE_TOOLS = (
+    # GCP Tools
+    gcp_monitoring_tool,
+    gcp_billing_tool,
+    gcp_usage_tool,
+    # CRM/Ticketing Tools
+    create_case_tool,
+    get_customer_profile_tool,
+    get_customer_profiles_tool,
+    # Communication Tools
+    gmail_draft_tool,
+    gmail_draft_batch_tool,
+    google_chat_tool,
+    google_slides_tool,
+    # Knowledge/RAG Tools
+    internal_knowledge_search_tool,
+)
+
+_PARALLEL_TOOLS = {t.fn.__name__: t for t in GROUPABLE_TOOLS}
+
+def _run_call(call) -> str:
+    """Runs one call from a group, returning its labelled result or error."""
+    # The model may send malformed entries; report them against their own
+    # call so the results of sibling calls, some of which may have side
+    # effects, are still returned.
+    if not isinstance(call, dict):
+        return f"[invalid call]\nError: expected an object with 'tool' and 'args', got {call!r}."
+    tool_name = call.get("tool")
+    if tool_name not in _PARALLEL_TOOLS:
+        return f"[{tool_name}]\nUnknown tool '{tool_name}'."
+    try:
+        result = _PARALLEL_TOOLS[tool_name].fn(**call.get("args", {}))
+    except Exception as e:
+        logger.warning("Tool '%s' failed in parallel group: %s", tool_name, e)
+        result = f"Error: {tool_name} failed: {e}"
+    return f"[{tool_name}]\n{result}"
+
+@tool
+def parallel_tool_group(calls: list[dict]) -> str:
+    """
+    Runs several independent tool calls at the same time and returns all of their results.
+    Use this when none of the calls needs the output of another.
+    Each call is an object of the form {"tool": "<tool name>", "args": {<tool arguments>}}.
+    """
+    logger.debug("TOOL: Running %d tool calls in parallel...", len(calls))
+    return "\n\n".join(tool_executor.map(_run_call, calls))
@@ -0,0 +1,19 @@
+# Predefined prompts that demonstrate each of the agent's core capabilities
+SCENARIOS = (
+    {
+        "title": "Proactive Health & Optimization",
+        "prompt": "Run a proactive health and cost check for Customer X and draft an email to the internal engineering team with the findings."
+    },
+    {
+        "title": "Issue & Escalation Management",
+        "prompt": "We have a P1 incident for Customer Y regarding 'database latency'. Create a support case, notify the incident chat room, and check our knowledge base for post-mortems on similar issues."
+    },
+    {
+        "title": "Strategic Roadmap & QBR",
+        "prompt": "Prepare the Q2 2026 QBR deck for Customer Z."
+    },
+    {
+        "title": "New Product Adoption & Launch Planning",
+        "prompt": "A new service, 'AlloyDB Omni for Postgres', was just announced. Identify which of my customers are heavy Postgres users and draft an introductory email for them."
+    },
+)
@@ -1,8 +1,14 @@
 from google.adk.agents.llm_agent import Agent
 from tam_assistant import google_workspace
 from google.adk.tools.tool import Tool
+import atexit
 import base64
+import codecs
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
+from googleapiclient.http import MediaIoBaseDownload
 
 PROMPT_TEMPLATE = """
 As a Technical Account Manager (TAM) Assistant, your primary role is to assist TAMs by drafting email replies to customers.
@@ -26,9 +32,46 @@ You have access to the following tools to help you:
 Remember, you are drafting an email on behalf of the TAM. The final email should be ready for the TAM to review and send.
 """
 
+# googleapiclient services are not thread-safe (they share one httplib2
+# connection), so each thread builds its own and then keeps reusing it.
+_services = threading.local()
+_all_services = []
+_all_services_lock = threading.Lock()
+
+def _get_service(name: str, factory):
+    service = getattr(_services, name, None)
+    if service is None:
+        service = factory()
+        setattr(_services, name, service)
+        with _all_services_lock:
+            _all_services.append(service)
+    return service
+
+def _get_drive():
+    return _get_service("drive", google_workspace.get_drive_service)
+
+def _get_gmail():
+    return _get_service("gmail", google_workspace.get_gmail_service)
+
+# Long-lived workers, so their thread-local Drive services stay warm
+_drive_pool = ThreadPoolExecutor(max_workers=4)
+
+# Google's batch endpoint accepts at most 100 calls per request
+_DRIVE_BATCH_LIMIT = 100
+
+# Large enough to amortize per-request overhead, small enough to bound memory
+_DRIVE_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+@atexit.register
+def _close_services():
+    with _all_services_lock:
+        for service in _all_services:
+            service.close()
+        _all_services.clear()
+
 def list_drive_files(number_of_files: int = 10):
     """List files from Google Drive."""
-    drive_service = google_workspace.get_drive_service()
+    drive_service = _get_drive()
     results = (
         drive_service.files()
         .list(pageSize=number_of_files, fields="nextPageToken, files(id, name)")
@@ -37,17 +80,63 @@ def list_drive_files(number_of_files: int = 10):
     items = results.get("files", [])
     return items
 
+def _get_drive_file_name(file_id: str) -> str:
+    drive_service = _get_drive()
+    return drive_service.files().get(fileId=file_id, fields="name").execute()["name"]
+
+def _get_drive_file_content(file_id: str) -> str:
+    drive_service = _get_drive()
+    request = drive_service.files().get_media(fileId=file_id)
+
+    # Download in chunks and decode each one as it arrives, so only one raw
+    # chunk is held in memory alongside the decoded text.
+    buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(buffer, request, chunksize=_DRIVE_DOWNLOAD_CHUNK_SIZE)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pieces = []
+    done = False
+    while not done:
+        _, done = downloader.next_chunk()
+        pieces.append(decoder.decode(buffer.getvalue(), final=done))
+        buffer.seek(0)
+        buffer.truncate()
+    return "".join(pieces)
+
 def read_drive_file(file_id: str):
     """Read a file from Google Drive."""
-    drive_service = google_workspace.get_drive_service()
-    file = drive_service.files().get(fileId=file_id).execute()
-    request = drive_service.files().get_media(fileId=file_id)
-    file_content = request.execute()
-    return {"name": file["name"], "content": file_content.decode("utf-8")}
+    # Name and content are independent requests, so fetch them concurrently
+    name = _drive_pool.submit(_get_drive_file_name, file_id)
+    content = _drive_pool.submit(_get_drive_file_content, file_id)
+    return {"name": name.result(), "content": content.result()}
+
+def read_drive_files(file_ids: list[str]):
+    """Read several files from Google Drive."""
+    # Media downloads can't be batched, so they run on the pool while the
+    # names are fetched in batched requests of up to 100 files each.
+    contents = _drive_pool.map(_get_drive_file_content, file_ids)
+
+    drive_service = _get_drive()
+    names = {}
+
+    def store_name(request_id, response, exception):
+        if exception is not None:
+            raise exception
+        names[int(request_id)] = response["name"]
+
+    for offset in range(0, len(file_ids), _DRIVE_BATCH_LIMIT):
+        batch = drive_service.new_batch_http_request(callback=store_name)
+        for index, file_id in enumerate(file_ids[offset:offset + _DRIVE_BATCH_LIMIT], start=offset):
+            batch.add(drive_service.files().get(fileId=file_id, fields="name"), request_id=str(index))
+        batch.execute()
+
+    return [
+        {"name": names[index], "content": content}
+        for index, content in enumerate(contents)
+    ]
 
 def read_gmail_message(message_id: str):
     """Read a message from Gmail."""
-    gmail_service = google_workspace.get_gmail_service()
+    gmail_service = _get_gmail()
     message = (
         gmail_service.users()
         .messages()
@@ -56,13 +145,32 @@ def read_gmail_message(message_id: str):
     )
     return message
 
-def send_gmail_message(to: str, subject: str, message_text: str):
-    """Send a message from Gmail."""
-    gmail_service = google_workspace.get_gmail_service()
+def _is_plain_header(value: str) -> bool:
+    return value.isascii() and "\r" not in value and "\n" not in value
+
+def _build_raw(to: str, subject: str, message_text: str) -> bytes:
+    """Build an RFC 822 plain-text message."""
+    if _is_plain_header(to) and _is_plain_header(subject):
+        # Common case: headers need no RFC 2047 encoding, so skip the
+        # email package's generator and assemble the message directly.
+        raw = bytearray(b"Content-Type: text/plain; charset=utf-8\r\n")
+        raw += b"MIME-Version: 1.0\r\n"
+        raw += b"Content-Transfer-Encoding: 8bit\r\n"
+        raw += b"To: " + to.encode("ascii") + b"\r\n"
+        raw += b"Subject: " + subject.encode("ascii") + b"\r\n\r\n"
+        raw += message_text.encode("utf-8")
+        return bytes(raw)
+
     message = MIMEText(message_text)
     message["to"] = to
     message["subject"] = subject
-    raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    return message.as_bytes()
+
+def send_gmail_message(to: str, subject: str, message_text: str):
+    """Send a message from Gmail."""
+    gmail_service = _get_gmail()
+    # The request body is JSON, so the encoded message must be a str
+    raw_message = base64.urlsafe_b64encode(_build_raw(to, subject, message_text)).decode()
     body = {"raw": raw_message}
     message = (
         gmail_service.users().messages().send(userId="me", body=body).execute()
@@ -85,6 +193,11 @@ root_agent = Agent(
             description="Read a file from Google Drive.",
             func=read_drive_file,
         ),
+        Tool(
+            name="read_drive_files",
+            description="Read several files from Google Drive at once.",
+            func=read_drive_files,
+        ),
         Tool(
             name="read_gmail_message",
             description="Read a message from Gmail.",
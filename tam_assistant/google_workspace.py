@@ -1,4 +1,5 @@
 import os.path
+import threading
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -8,10 +9,22 @@ from googleapiclient.discovery import build
 # If modifying these scopes, delete the file token.json.
 SCOPES = ["https://www.googleapis.com/auth/drive.readonly", "https://www.googleapis.com/auth/gmail.readonly", "https://www.googleapis.com/auth/gmail.send"]
 
+# Credentials are loaded once and shared by every thread's services; the lock
+# stops concurrent callers from running the OAuth flow or writing token.json twice.
+_creds = None
+_creds_lock = threading.Lock()
+
 def get_credentials():
     """Shows basic usage of the Drive v3 API.
     Prints the names and ids of the first 10 files the user has access to.
     """
+    global _creds
+    with _creds_lock:
+        if _creds is None or not _creds.valid:
+            _creds = _load_credentials()
+        return _creds
+
+def _load_credentials():
     creds = None
     # The file token.json stores the user's access and refresh tokens, and is
     # created automatically when the authorization flow completes for the first